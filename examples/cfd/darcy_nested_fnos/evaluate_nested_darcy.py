@@ -116,6 +116,7 @@ def EvaluateModel(
 
 def AssembleSolutionToDict(cfg: DictConfig, perm: dict, darcy: dict, pos: dict):
     dat, idx = {}, 0
+    ins_pos, ins_samp = [], []
     for ii in range(perm["ref0"].shape[0]):
         samp = str(ii)
         dat[samp] = {
@@ -135,12 +136,21 @@ def AssembleSolutionToDict(cfg: DictConfig, perm: dict, darcy: dict, pos: dict):
                 "darcy": darcy["ref1"][idx, 0, ...],
                 "pos": ps,
             }
+            ins_pos.append(ps)
+            ins_samp.append(ii)
             idx += 1
 
     if cfg.inference.save_result:
-        np.save(
-            "./nested_darcy_results.npy",
-            dat,
+        # store the flat arrays instead of pickling the nested dict, inset i of
+        # the ref1 arrays belongs to sample sample_ref1[i] at position pos_ref1[i]
+        np.savez(
+            "./nested_darcy_results.npz",
+            permeability_ref0=perm["ref0"][:, 0, ...],
+            darcy_ref0=darcy["ref0"][:, 0, ...],
+            permeability_ref1=perm["ref1"][:idx, 1, ...],
+            darcy_ref1=darcy["ref1"][:idx, 0, ...],
+            pos_ref1=np.array(ins_pos),
+            sample_ref1=np.array(ins_samp),
         )
     return dat
 
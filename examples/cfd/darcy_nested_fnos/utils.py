@@ -203,13 +203,19 @@ class GridValidator:
         loss = self.criterion(prediction, target)
         norm = self.norm
 
-        # pick first sample from batch
-        invar = invar * norm["permeability"][1] + norm["permeability"][0]
-        target = target * norm["darcy"][1] + norm["darcy"][0]
-        prediction = prediction * norm["darcy"][1] + norm["darcy"][0]
-        invar = invar.cpu().numpy()[0, -1, :, :]
-        target = target.cpu().numpy()[0, 0, :, :]
-        prediction = prediction.detach().cpu().numpy()[0, 0, :, :]
+        # pick first sample from batch before inverting normalisation and copy
+        # all three fields to the host in a single transfer
+        invar, target, prediction = (
+            torch.stack(
+                (
+                    invar[0, -1] * norm["permeability"][1] + norm["permeability"][0],
+                    target[0, 0] * norm["darcy"][1] + norm["darcy"][0],
+                    prediction[0, 0].detach() * norm["darcy"][1] + norm["darcy"][0],
+                )
+            )
+            .cpu()
+            .numpy()
+        )
 
         plt.close("all")
         plt.rcParams.update({"font.size": self.font_size})
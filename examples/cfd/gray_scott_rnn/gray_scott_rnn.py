@@ -46,7 +46,7 @@ def prepare_data(
             data_u = data[str(i)]["u"]
             data_v = data[str(i)]["v"]
             data_uv = np.stack([data_u, data_v], axis=0)
-            data_uv = np.array(data_uv)
+            data_uv = data_uv.astype(np.float32)
             list_data.append(data_uv)
 
         data.close()
@@ -66,12 +66,14 @@ def prepare_data(
         h.close()
 
 
-def validation_step(model, dataloader, epoch):
+@torch.no_grad()
+def validation_step(model, dataloader, epoch, device="cuda"):
     model.eval()
 
-    for data in dataloader:
-        invar, outvar = data
-        predvar = model(invar)
+    # only a single batch is plotted, so skip the forward pass for all others
+    invar, outvar = next(iter(dataloader))
+    invar = invar.to(device, non_blocking=True)
+    predvar = model(invar)
 
     # convert data to numpy
     outvar = outvar.detach().cpu().numpy()
@@ -87,6 +89,8 @@ def validation_step(model, dataloader, epoch):
         }
         imageToVTK(f"./test_{t}", cellData=cellData)
 
+    model.train()
+
 
 class HDF5MapStyleDataset(Dataset):
     def __init__(
@@ -97,6 +101,10 @@ class HDF5MapStyleDataset(Dataset):
         self.file_path = file_path
         with h5py.File(file_path, "r") as f:
             self.keys = list(f.keys())
+            self.length = len(f[self.keys[0]])
+        # Will be populated on first access so every dataloader worker opens its
+        # own handle, which is then kept open instead of re-opened per sample.
+        self.data_file = None
 
         # Set up device, needed for pipeline
         if isinstance(device, str):
@@ -107,17 +115,15 @@ class HDF5MapStyleDataset(Dataset):
         self.device = device
 
     def __len__(self):
-        with h5py.File(self.file_path, "r") as f:
-            return len(f[self.keys[0]])
+        return self.length
 
     def __getitem__(self, idx):
-        data = {}
-        with h5py.File(self.file_path, "r") as f:
-            for key in self.keys:
-                data[key] = np.array(f[key][idx])
+        if self.data_file is None:
+            self.data_file = h5py.File(self.file_path, "r")
 
-        invar = torch.from_numpy(data["invar"])
-        outvar = torch.from_numpy(data["outvar"])
+        # h5py already returns a fresh array, wrap it without another copy
+        invar = torch.from_numpy(self.data_file["invar"][idx])
+        outvar = torch.from_numpy(self.data_file["outvar"][idx])
         if self.device.type == "cuda":
             # Move tensors to GPU
             invar = invar.cuda()
@@ -184,18 +190,31 @@ def main(cfg: DictConfig) -> None:
         start_timestep,
     )
 
-    train_dataset = HDF5MapStyleDataset(train_save_path, device="cuda")
+    # set device as GPU
+    device = "cuda"
+
+    # samples are read on the host by the dataloader workers and copied to the
+    # device asynchronously from pinned memory in the training loop
+    train_dataset = HDF5MapStyleDataset(train_save_path, device="cpu")
     train_dataloader = DataLoader(
-        train_dataset, batch_size=cfg.batch_size, shuffle=True
+        train_dataset,
+        batch_size=cfg.batch_size,
+        shuffle=True,
+        num_workers=cfg.num_workers,
+        pin_memory=True,
+        persistent_workers=cfg.num_workers > 0,
     )
-    test_dataset = HDF5MapStyleDataset(test_save_path, device="cuda")
+    # validation only plots the first batch, so read it in the main process
+    # instead of having workers prefetch batches that are thrown away
+    test_dataset = HDF5MapStyleDataset(test_save_path, device="cpu")
     test_dataloader = DataLoader(
-        test_dataset, batch_size=cfg.batch_size_test, shuffle=False
+        test_dataset,
+        batch_size=cfg.batch_size_test,
+        shuffle=False,
+        num_workers=0,
+        pin_memory=True,
     )
 
-    # set device as GPU
-    device = "cuda"
-
     # instantiate model
     arch = One2ManyRNN(
         input_channels=2,
@@ -240,6 +259,8 @@ def main(cfg: DictConfig) -> None:
             # go through the full dataset
             for i, data in enumerate(train_dataloader):
                 invar, outvar = data
+                invar = invar.to(device, non_blocking=True)
+                outvar = outvar.to(device, non_blocking=True)
                 optimizer.zero_grad()
                 outpred = arch(invar)
 
@@ -252,7 +273,7 @@ def main(cfg: DictConfig) -> None:
             log.log_epoch({"Learning Rate": optimizer.param_groups[0]["lr"]})
 
         with LaunchLogger("valid", epoch=epoch) as log:
-            validation_step(arch, test_dataloader, epoch)
+            validation_step(arch, test_dataloader, epoch, device)
 
         if epoch % cfg.checkpoint_save_freq == 0:
             save_checkpoint(
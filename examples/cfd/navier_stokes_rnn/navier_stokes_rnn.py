@@ -43,41 +43,41 @@ def prepare_data(
     if Path(output_data_path).is_file():
         pass
     else:
-        arrays = {}
-        data = h5py.File(input_data_path)
-
-        for k, v in data.items():
-            arrays[k] = np.array(v)
-
-        invar = arrays["u"][
-            input_nr_tsteps : input_nr_tsteps + predict_nr_tsteps,
-            ...,
-            start_idx : start_idx + num_samples,
-        ]
-        outvar = arrays["u"][
-            input_nr_tsteps
-            + predict_nr_tsteps : input_nr_tsteps
-            + 2 * predict_nr_tsteps,
-            ...,
-            start_idx : start_idx + num_samples,
-        ]
+        # read only the required steps and samples instead of loading every
+        # variable of the raw file into memory
+        with h5py.File(input_data_path, "r") as data:
+            invar = data["u"][
+                input_nr_tsteps : input_nr_tsteps + predict_nr_tsteps,
+                ...,
+                start_idx : start_idx + num_samples,
+            ]
+            outvar = data["u"][
+                input_nr_tsteps
+                + predict_nr_tsteps : input_nr_tsteps
+                + 2 * predict_nr_tsteps,
+                ...,
+                start_idx : start_idx + num_samples,
+            ]
         invar = np.moveaxis(invar, -1, 0)
         outvar = np.moveaxis(outvar, -1, 0)
         invar = np.expand_dims(invar, axis=1)
         outvar = np.expand_dims(outvar, axis=1)
 
         h = h5py.File(output_data_path, "w")
-        h.create_dataset("invar", data=invar)
-        h.create_dataset("outvar", data=outvar)
+        h.create_dataset("invar", data=invar, dtype=np.float32)
+        h.create_dataset("outvar", data=outvar, dtype=np.float32)
         h.close()
 
 
-def validation_step(model, dataloader, epoch):
+@torch.no_grad()
+def validation_step(model, dataloader, epoch, device="cuda"):
     model.eval()
 
     loss_epoch = 0
     for data in dataloader:
         invar, outvar = data
+        invar = invar.to(device, non_blocking=True)
+        outvar = outvar.to(device, non_blocking=True)
         predvar = model(invar)
         loss_epoch += F.mse_loss(outvar, predvar)
 
@@ -95,6 +95,8 @@ def validation_step(model, dataloader, epoch):
 
     fig.savefig(f"./test_{epoch}.png")
     plt.close()
+
+    model.train()
     return loss_epoch / len(dataloader)
 
 
@@ -107,6 +109,10 @@ class HDF5MapStyleDataset(Dataset):
         self.file_path = file_path
         with h5py.File(file_path, "r") as f:
             self.keys = list(f.keys())
+            self.length = len(f[self.keys[0]])
+        # Will be populated on first access so every dataloader worker opens its
+        # own handle, which is then kept open instead of re-opened per sample.
+        self.data_file = None
 
         # Set up device, needed for pipeline
         if isinstance(device, str):
@@ -117,17 +123,15 @@ class HDF5MapStyleDataset(Dataset):
         self.device = device
 
     def __len__(self):
-        with h5py.File(self.file_path, "r") as f:
-            return len(f[self.keys[0]])
+        return self.length
 
     def __getitem__(self, idx):
-        data = {}
-        with h5py.File(self.file_path, "r") as f:
-            for key in self.keys:
-                data[key] = np.array(f[key][idx])
+        if self.data_file is None:
+            self.data_file = h5py.File(self.file_path, "r")
 
-        invar = torch.from_numpy(data["invar"])
-        outvar = torch.from_numpy(data["outvar"])
+        # h5py already returns a fresh array, wrap it without another copy
+        invar = torch.from_numpy(self.data_file["invar"][idx])
+        outvar = torch.from_numpy(self.data_file["outvar"][idx])
         if self.device.type == "cuda":
             # Move tensors to GPU
             invar = invar.cuda()
@@ -200,18 +204,30 @@ def main(cfg: DictConfig) -> None:
         test_samples,
     )
 
-    train_dataset = HDF5MapStyleDataset(train_save_path, device="cuda")
+    # set device as GPU
+    device = "cuda"
+
+    # samples are read on the host by the dataloader workers and copied to the
+    # device asynchronously from pinned memory in the training loop
+    train_dataset = HDF5MapStyleDataset(train_save_path, device="cpu")
     train_dataloader = DataLoader(
-        train_dataset, batch_size=cfg.batch_size, shuffle=True
+        train_dataset,
+        batch_size=cfg.batch_size,
+        shuffle=True,
+        num_workers=cfg.num_workers,
+        pin_memory=True,
+        persistent_workers=cfg.num_workers > 0,
     )
-    test_dataset = HDF5MapStyleDataset(test_save_path, device="cuda")
+    test_dataset = HDF5MapStyleDataset(test_save_path, device="cpu")
     test_dataloader = DataLoader(
-        test_dataset, batch_size=cfg.batch_size_test, shuffle=False
+        test_dataset,
+        batch_size=cfg.batch_size_test,
+        shuffle=False,
+        num_workers=cfg.num_workers,
+        pin_memory=True,
+        persistent_workers=cfg.num_workers > 0,
     )
 
-    # set device as GPU
-    device = "cuda"
-
     # instantiate model
     if cfg.model_type == "one2many":
         arch = One2ManyRNN(
@@ -268,6 +284,8 @@ def main(cfg: DictConfig) -> None:
             # go through the full dataset
             for data in train_dataloader:
                 invar, outvar = data
+                invar = invar.to(device, non_blocking=True)
+                outvar = outvar.to(device, non_blocking=True)
                 optimizer.zero_grad()
                 outpred = arch(invar)
 
@@ -280,7 +298,7 @@ def main(cfg: DictConfig) -> None:
             log.log_epoch({"Learning Rate": optimizer.param_groups[0]["lr"]})
 
         with LaunchLogger("valid", epoch=epoch) as log:
-            error = validation_step(arch, test_dataloader, epoch)
+            error = validation_step(arch, test_dataloader, epoch, device)
             log.log_epoch({"Validation error": error})
 
         if epoch % cfg.checkpoint_save_freq == 0:
@@ -14,7 +14,7 @@
 
 import torch, dgl
 from dgl.dataloading import GraphDataLoader
-import torch
+from torch.cuda.amp import autocast
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib import animation
@@ -76,12 +76,20 @@ class MGNRollout:
 
         self.var_identifier = {"u": 0, "v": 1, "p": 2}
 
-    def predict(self, idx):
-        self.pred, self.exact, self.faces, self.graphs = [], [], [], []
-        stats = {
+        # make animations dir
+        os.makedirs("./animations", exist_ok=True)
+
+        # normalization stats are fixed, move them to the device once
+        self.stats = {
             key: value.to(self.device) for key, value in self.dataset.node_stats.items()
         }
+
+    def predict(self):
+        self.pred, self.exact, self.faces, self.graphs = [], [], [], []
+        stats = self.stats
         for i, (graph, cells, mask) in enumerate(self.dataloader):
+            # keep the host graph for plotting, only its mesh positions are used
+            self.graphs.append(graph)
             graph = graph.to(self.device)
             # denormalize data
             graph.ndata["x"][:, 0:2] = self.dataset.denormalize(
@@ -96,13 +104,15 @@ class MGNRollout:
             # inference step
             invar = graph.ndata["x"].clone()
 
+            # roll out from the previous prediction, which is kept on the device
             if i % (C.num_test_time_steps - 1) != 0:
-                invar[:, 0:2] = self.pred[i - 1][:, 0:2].clone()
-                i += 1
+                invar[:, 0:2] = pred_prev[:, 0:2]
             invar[:, 0:2] = self.dataset.normalize_node(
                 invar[:, 0:2], stats["velocity_mean"], stats["velocity_std"]
             )
-            pred_i = self.model(invar, graph.edata["x"], graph).detach()  # predict
+            with autocast(enabled=C.amp, dtype=torch.float16):
+                pred_i = self.model(invar, graph.edata["x"], graph).detach()  # predict
+            pred_i = pred_i.float()
 
             # denormalize prediction
             pred_i[:, 0:2] = self.dataset.denormalize(
@@ -116,35 +126,29 @@ class MGNRollout:
             )
 
             # do not update the "wall_boundary" & "outflow" nodes
-            mask = torch.cat((mask, mask), dim=-1).to(self.device)
-            pred_i[:, 0:2] = torch.where(
-                mask, pred_i[:, 0:2], torch.zeros_like(pred_i[:, 0:2])
-            )
-
-            # integration
-            self.pred.append(
-                torch.cat(
-                    ((pred_i[:, 0:2] + invar[:, 0:2]), pred_i[:, [2]]), dim=-1
-                ).cpu()
-            )
-            self.exact.append(
-                torch.cat(
-                    (
-                        (graph.ndata["y"][:, 0:2] + graph.ndata["x"][:, 0:2]),
-                        graph.ndata["y"][:, [2]],
-                    ),
-                    dim=-1,
-                ).cpu()
-            )
+            # the loader stacks the mask to [1, N, 1], flatten it to [N, 1] so it
+            # broadcasts over both velocity components of the in-place update
+            mask = mask.view(-1, 1).to(self.device)
+            pred_i[:, 0:2].masked_fill_(~mask, 0.0)
+
+            # integration, in place on the velocity columns
+            pred_i[:, 0:2] += invar[:, 0:2]
+            pred_prev = pred_i
+            exact_i = graph.ndata["y"].clone()
+            exact_i[:, 0:2] += graph.ndata["x"][:, 0:2]
+            # copy back asynchronously, synchronized once after the rollout
+            self.pred.append(pred_i.to("cpu", non_blocking=True))
+            self.exact.append(exact_i.to("cpu", non_blocking=True))
 
             self.faces.append(torch.squeeze(cells).numpy())
-            self.graphs.append(graph.cpu())
 
-        # keep the QoI only
-        self.pred = [var[:, idx] for var in self.pred]
-        self.exact = [var[:, idx] for var in self.exact]
+        if self.device == "cuda":
+            torch.cuda.synchronize()
+
+    def init_animation(self, idx):
+        # the rollout holds all variables, animate the QoI only
+        self.idx = idx
 
-    def init_animation(self):
         # fig configs
         plt.rcParams["image.cmap"] = "inferno"
         self.fig, self.ax = plt.subplots(2, 1, figsize=(16, 9))
@@ -154,15 +158,11 @@ class MGNRollout:
         self.ax[0].set_facecolor("black")
         self.ax[1].set_facecolor("black")
 
-        # make animations dir
-        if not os.path.exists("./animations"):
-            os.makedirs("./animations")
-
     def animate(self, num):
         num *= C.frame_skip
         graph = self.graphs[num]
-        y_star = self.pred[num].numpy()
-        y_exact = self.exact[num].numpy()
+        y_star = self.pred[num][:, self.idx].numpy()
+        y_exact = self.exact[num][:, self.idx].numpy()
         triang = mtri.Triangulation(
             graph.ndata["mesh_pos"][:, 0].numpy(),
             graph.ndata["mesh_pos"][:, 1].numpy(),
@@ -203,15 +203,16 @@ if __name__ == "__main__":
     logger.file_logging()
     logger.info("Rollout started...")
     rollout = MGNRollout(logger)
-    idx = [rollout.var_identifier[k] for k in C.viz_vars]
-    for i in idx:
-        rollout.predict(i)
-        rollout.init_animation()
+    # the rollout does not depend on the visualized variable, run it only once
+    rollout.predict()
+    logger.info("Completed rollout")
+    for var in C.viz_vars:
+        rollout.init_animation(rollout.var_identifier[var])
         ani = animation.FuncAnimation(
             rollout.fig,
             rollout.animate,
             frames=len(rollout.graphs) // C.frame_skip,
             interval=C.frame_interval,
         )
-        ani.save("animations/animation_" + C.viz_vars[i] + ".gif")
-        logger.info(f"Completed rollout for {C.viz_vars[i]}")
+        ani.save("animations/animation_" + var + ".gif")
+        logger.info(f"Completed animation for {var}")
@@ -97,7 +97,7 @@ class MGNTrainer:
         self.scheduler = torch.optim.lr_scheduler.LambdaLR(
             self.optimizer, lr_lambda=lambda epoch: C.lr_decay_rate**epoch
         )
-        self.scaler = GradScaler()
+        self.scaler = GradScaler(enabled=C.amp)
 
         # load checkpoint
         if dist.world_size > 1:
@@ -121,20 +121,16 @@ class MGNTrainer:
 
     def forward(self, graph):
         # forward pass
-        with autocast(enabled=C.amp):
+        with autocast(enabled=C.amp, dtype=torch.float16):
             pred = self.model(graph.ndata["x"], graph.edata["x"], graph)
             loss = self.criterion(pred, graph.ndata["y"])
             return loss
 
     def backward(self, loss):
-        # backward pass
-        if C.amp:
-            self.scaler.scale(loss).backward()
-            self.scaler.step(self.optimizer)
-            self.scaler.update()
-        else:
-            loss.backward()
-            self.optimizer.step()
+        # backward pass, the scaler is a no-op if amp is disabled
+        self.scaler.scale(loss).backward()
+        self.scaler.step(self.optimizer)
+        self.scaler.update()
 
 
 if __name__ == "__main__":
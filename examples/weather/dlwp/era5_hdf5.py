@@ -291,11 +291,11 @@ class ERA5HDF5Datapipe(Datapipe):
             )
             # Update length of dataset
             self.length = len(source) // self.batch_size
-            # Read current batch.
+            # Read current batch, samples are loaded by the py_num_workers processes.
             invar, outvar, invar_idx, outvar_idx, year_idx = dali.fn.external_source(
                 source,
                 num_outputs=5,
-                parallel=False,
+                parallel=True,
                 batch=False,
             )
             if self.device.type == "cuda":
@@ -389,6 +389,8 @@ class ERA5DaliExternalSource:
         self.num_samples_per_year = num_samples_per_year
         self.batch_size = batch_size
         self.shuffle = shuffle
+        self.process_rank = process_rank
+        self.world_size = world_size
 
         self.last_epoch = None
 
@@ -414,9 +416,14 @@ class ERA5DaliExternalSource:
 
         # Shuffle before the next epoch starts.
         if self.shuffle and sample_info.epoch_idx != self.last_epoch:
-            # All workers use the same rng seed so the resulting
-            # indices are the same across workers.
-            np.random.default_rng(seed=sample_info.epoch_idx).shuffle(self.indices)
+            # All workers and ranks use the same rng seed so the resulting
+            # permutation is the same everywhere. Shuffle the global indices
+            # before sharding so samples are mixed across ranks, not only
+            # within the local shard.
+            indices = np.random.default_rng(seed=sample_info.epoch_idx).permutation(
+                self.num_samples
+            )
+            self.indices = np.array_split(indices, self.world_size)[self.process_rank]
             self.last_epoch = sample_info.epoch_idx
 
         # Get local indices from global index.
@@ -425,24 +432,16 @@ class ERA5DaliExternalSource:
         in_idx = idx % self.num_samples_per_year
 
         data = self.data_files[year_idx]["fields"]
-        # Has [T,C,H,W] shape.
-        invar_idx = []
-        invar = np.empty((self.num_input_steps,) + data.shape[1:], dtype=data.dtype)
-        for i in range(self.num_input_steps):
-            in_idx = in_idx + i * self.stride
-            invar_idx.append(in_idx)
-            invar[i] = data[in_idx, self.chans]
-
-        # Has [T,C,H,W] shape.
-        outvar_idx = []
-        outvar = np.empty((self.num_output_steps,) + data.shape[1:], dtype=data.dtype)
-        for i in range(self.num_output_steps):
-            out_idx = in_idx + (i + 1) * self.stride
-            outvar_idx.append(out_idx)
-            outvar[i] = data[out_idx, self.chans]
-
-        invar_idx = np.array(invar_idx)
-        outvar_idx = np.array(outvar_idx)
+        # Input and output steps are consecutive strides of the same sequence,
+        # so read them with a single strided HDF5 selection. Has [T,C,H,W] shape.
+        num_steps = self.num_input_steps + self.num_output_steps
+        step_idx = in_idx + self.stride * np.arange(num_steps)
+        steps = data[int(in_idx) : int(step_idx[-1]) + 1 : self.stride, self.chans]
+
+        invar = steps[: self.num_input_steps]
+        outvar = steps[self.num_input_steps :]
+        invar_idx = step_idx[: self.num_input_steps]
+        outvar_idx = step_idx[self.num_input_steps :]
         year_idx = np.array(year_idx)
 
         return invar, outvar, invar_idx, outvar_idx, year_idx
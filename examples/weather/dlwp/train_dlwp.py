@@ -48,57 +48,45 @@ def loss_func(x, y, p=2.0):
     return torch.mean(diff_norms / y_norms)
 
 
+def compute_tisr(
+    datapipe_start_year, idx_list, year_idx, longrid, latgrid, device, dtype
+):
+    # insolation for every sample and time step of the rollout, the indices are
+    # fetched once and the result is copied to the device in a single transfer
+    idx_list = idx_list.cpu().numpy()
+    year_idx = year_idx.cpu().numpy()
+    tisr = np.empty(idx_list.shape + longrid.shape, dtype=np.float32)
+    for j in range(idx_list.shape[0]):
+        year = int(datapipe_start_year + year_idx[j])
+        start_date = datetime.datetime(year, 1, 1, 0, 0)
+        for i, id in enumerate(idx_list[j]):
+            time_delta = datetime.timedelta(hours=int(id) * 6)
+            result_time = start_date + time_delta
+            cos_zenith = zenith_angle.cos_zenith_angle(result_time, longrid, latgrid)
+            tisr[j, i] = np.maximum(cos_zenith, 0) - (1 / np.pi)  # subtract mean value
+    return torch.from_numpy(tisr).to(device=device, dtype=dtype).unsqueeze(dim=2)
+
+
 def prepare_input(
     input_list,
-    datapipe_start_year,
-    idx_list,
-    year_idx,
+    tisr,
     lsm,
-    longrid,
-    latgrid,
     topographic_height,
-    device,
     batchsize,
 ):
-    # TODO: Add an assertion check here to ensure the idx_list has same number of elements as the input_list!
+    # TODO: Add an assertion check here to ensure the tisr has same number of time steps as the input_list!
+    # collect all channel blocks and concatenate once, the time dimension is
+    # folded into channels followed by the static fields
+    input_model = []
     for i in range(len(input_list)):
-        tisr = []
-        sub_idx_list = idx_list[:, i]
-        for j, id in enumerate(sub_idx_list):
-            year = datapipe_start_year + year_idx[j]
-            start_date = datetime.datetime(year.item(), 1, 1, 0, 0)
-            time_delta = datetime.timedelta(hours=id.item() * 6)
-            result_time = start_date + time_delta
-            # print(result_time, year.item(), id.item())
-            tisr.append(
-                np.maximum(
-                    zenith_angle.cos_zenith_angle(result_time, longrid, latgrid), 0
-                )
-                - (1 / np.pi)
-            )  # subtract mean value
-        tisr = np.stack(tisr, axis=0)
-        tisr = torch.tensor(tisr, dtype=input_list[0].dtype).to(device).unsqueeze(dim=1)
-        input_list[i] = torch.cat((input_list[i], tisr), dim=1)
-
-    input_model = torch.cat(
-        input_list, dim=1
-    )  # concat the time dimension into channels
-
-    repeat_vals = (batchsize, -1, -1, -1, -1)  # repeat along batch dimension
-    lsm_tensor = (
-        torch.tensor(lsm, dtype=input_list[0].dtype).to(device).unsqueeze(dim=0)
-    )
-    lsm_tensor = lsm_tensor.expand(*repeat_vals)
-    # normalize topographic height
-    topographic_height = (topographic_height - 3.724e03) / 8.349e03
-    topographic_height_tensor = (
-        torch.tensor(topographic_height, dtype=input_list[0].dtype)
-        .to(device)
-        .unsqueeze(dim=0)
-    )
-    topographic_height_tensor = topographic_height_tensor.expand(*repeat_vals)
+        input_model += [input_list[i], tisr[:, i]]
+
+    # static fields are already on the device, expand along batch dimension
+    repeat_vals = (batchsize, -1, -1, -1, -1)
+    input_model.append(lsm.expand(*repeat_vals))
+    input_model.append(topographic_height.expand(*repeat_vals))
 
-    input_model = torch.cat((input_model, lsm_tensor, topographic_height_tensor), dim=1)
+    input_model = torch.cat(input_model, dim=1)
     return input_model
 
 
@@ -126,16 +114,20 @@ def validation_step(
         outvar = data[0]["outvar"]
         invar_list = torch.split(invar, 1, dim=1)  # split along the time dimension
         invar_list = [tensor.squeeze(dim=1) for tensor in invar_list]
-        invar_model = prepare_input(
-            invar_list,
+        tisr = compute_tisr(
             2016,
-            data[0]["invar_idx"],
+            torch.cat((data[0]["invar_idx"], data[0]["outvar_idx"]), dim=1),
             data[0]["year_idx"],
-            lsm,
             longrid,
             latgrid,
-            topographic_height,
             invar.device,
+            invar.dtype,
+        )
+        invar_model = prepare_input(
+            invar_list,
+            tisr[:, :num_input_steps],
+            lsm,
+            topographic_height,
             invar.size(0),
         )
 
@@ -148,23 +140,15 @@ def validation_step(
             )
             invar_model = prepare_input(
                 invar_list,
-                2016,
-                data[0]["outvar_idx"][
-                    :, t * num_input_steps : (t + 1) * num_input_steps
-                ],
-                data[0]["year_idx"],
+                tisr[:, (t + 1) * num_input_steps : (t + 2) * num_input_steps],
                 lsm,
-                longrid,
-                latgrid,
                 topographic_height,
-                invar.device,
                 invar.size(0),
             )
-            output_list = torch.split(
-                output, nr_output_channels // num_input_steps, dim=1
+            # unfold the time steps from the channel dimension as a view
+            output = output.reshape(
+                output.shape[0], num_input_steps, -1, *output.shape[2:]
             )
-            output_list = [tensor.unsqueeze(dim=1) for tensor in output_list]
-            output = torch.cat(output_list, dim=1)
             loss_epoch += F.mse_loss(
                 outvar[:, t * num_input_steps : t * num_input_steps + num_input_steps],
                 output,
@@ -177,6 +161,7 @@ def validation_step(
 
 @torch.no_grad()
 def plotting_step(
+    eval_step,
     arch,
     datapipe,
     datapipe_start_year,
@@ -195,16 +180,20 @@ def plotting_step(
         outvar = data[0]["outvar"].cpu().detach()
         invar_list = torch.split(invar, 1, dim=1)  # split along the time dimension
         invar_list = [tensor.squeeze(dim=1) for tensor in invar_list]
-        invar_model = prepare_input(
-            invar_list,
+        tisr = compute_tisr(
             datapipe_start_year,
-            data[0]["invar_idx"],
+            torch.cat((data[0]["invar_idx"], data[0]["outvar_idx"]), dim=1),
             data[0]["year_idx"],
-            lsm,
             longrid,
             latgrid,
-            topographic_height,
             invar.device,
+            invar.dtype,
+        )
+        invar_model = prepare_input(
+            invar_list,
+            tisr[:, :num_input_steps],
+            lsm,
+            topographic_height,
             invar.size(0),
         )
 
@@ -213,7 +202,7 @@ def plotting_step(
         # non over-lapping rollout
         for t in range(outvar.shape[1] // num_input_steps):
             # print(t)
-            output = arch(invar_model)
+            output = eval_step(arch, invar_model)
             invar_model = output
             invar_list = list(
                 torch.split(invar_model, (nr_output_channels // num_input_steps), dim=1)
@@ -221,26 +210,17 @@ def plotting_step(
             # print(data[0]["outvar_idx"][:,t*num_input_steps:(t+1)*num_input_steps], data[0]["year_idx"])
             invar_model = prepare_input(
                 invar_list,
-                datapipe_start_year,
-                data[0]["outvar_idx"][
-                    :, t * num_input_steps : (t + 1) * num_input_steps
-                ],
-                data[0]["year_idx"],
+                tisr[:, (t + 1) * num_input_steps : (t + 2) * num_input_steps],
                 lsm,
-                longrid,
-                latgrid,
                 topographic_height,
-                invar.device,
                 invar.size(0),
             )
 
-            output_list = torch.split(
-                output, nr_output_channels // num_input_steps, dim=1
-            )  # split along the channel dimension
-            output_list = [tensor.unsqueeze(dim=1) for tensor in output_list]
-            output = torch.cat(output_list, dim=1).cpu().detach()
-            pred_outvar[:, t * 2] = output[:, 0]
-            pred_outvar[:, t * 2 + 1] = output[:, 1]
+            # unfold the time steps from the channel dimension as a view
+            output = output.reshape(
+                output.shape[0], num_input_steps, -1, *output.shape[2:]
+            )
+            pred_outvar[:, t * num_input_steps : (t + 1) * num_input_steps] = output
 
         # Plotting
         if i == 0:
@@ -330,15 +310,23 @@ def main(cfg: DictConfig) -> None:
     # load static datasets
     lsm = xarray.open_dataset(
         to_absolute_path("./static_datasets/land_sea_mask_rs_cs.nc")
-    )["lsm"].values
+    )["lsm"].values.astype(np.float32)
     topographic_height = xarray.open_dataset(
         to_absolute_path("./static_datasets/geopotential_rs_cs.nc")
-    )["z"].values
+    )["z"].values.astype(np.float32)
     latlon_grids = xarray.open_dataset(
         to_absolute_path("./static_datasets/latlon_grid_field_rs_cs.nc")
     )
     latgrid, longrid = latlon_grids["latgrid"].values, latlon_grids["longrid"].values
 
+    # static fields do not change between steps, move them to the device once
+    lsm = torch.from_numpy(lsm).to(dist.device).unsqueeze(dim=0)
+    # normalize topographic height
+    topographic_height = (topographic_height - 3.724e03) / 8.349e03
+    topographic_height = (
+        torch.from_numpy(topographic_height).to(dist.device).unsqueeze(dim=0)
+    )
+
     optimizer = torch.optim.Adam(
         arch.parameters(),
         betas=(0.9, 0.999),
@@ -427,16 +415,20 @@ def main(cfg: DictConfig) -> None:
     def train_step_forward(arch, invar, outvar):
         invar_list = torch.split(invar, 1, dim=1)  # split along the time dimension
         invar_list = [tensor.squeeze(dim=1) for tensor in invar_list]
-        invar_model = prepare_input(
-            invar_list,
+        tisr = compute_tisr(
             1980,
-            data[0]["invar_idx"],
+            torch.cat((data[0]["invar_idx"], data[0]["outvar_idx"]), dim=1),
             data[0]["year_idx"],
-            lsm,
             longrid,
             latgrid,
-            topographic_height,
             dist.device,
+            invar.dtype,
+        )
+        invar_model = prepare_input(
+            invar_list,
+            tisr[:, :num_input_steps],
+            lsm,
+            topographic_height,
             invar.size(0),
         )
 
@@ -450,23 +442,15 @@ def main(cfg: DictConfig) -> None:
             )
             invar_model = prepare_input(
                 invar_list,
-                1980,
-                data[0]["outvar_idx"][
-                    :, t * num_input_steps : (t + 1) * num_input_steps
-                ],
-                data[0]["year_idx"],
+                tisr[:, (t + 1) * num_input_steps : (t + 2) * num_input_steps],
                 lsm,
-                longrid,
-                latgrid,
                 topographic_height,
-                dist.device,
                 invar.size(0),
             )
-            output_list = torch.split(
-                output, nr_output_channels // num_input_steps, dim=1
+            # unfold the time steps from the channel dimension as a view
+            output = output.reshape(
+                output.shape[0], num_input_steps, -1, *output.shape[2:]
             )
-            output_list = [tensor.unsqueeze(dim=1) for tensor in output_list]
-            output = torch.cat(output_list, dim=1)
             loss += F.mse_loss(
                 outvar[:, t * num_input_steps : t * num_input_steps + num_input_steps],
                 output,
@@ -506,6 +490,7 @@ def main(cfg: DictConfig) -> None:
 
                 # plot the data on out of sample dataset
                 plotting_step(
+                    eval_step_forward,
                     arch,
                     out_of_sample_datapipe,
                     2018,
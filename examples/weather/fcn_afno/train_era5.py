@@ -57,22 +57,23 @@ def validation_step(eval_step, fcn_model, datapipe, channels=[0, 1], epoch=0):
     fcn_model.eval()
     for i, data in enumerate(datapipe):
         invar = data[0]["invar"].detach()
-        outvar = data[0]["outvar"].cpu().detach()
-        predvar = torch.zeros_like(outvar)
+        outvar = data[0]["outvar"].detach()
+        # rollout is written into a preallocated buffer and stays on the device
+        predvar = torch.empty_like(outvar)
 
         for t in range(outvar.shape[1]):
             output = eval_step(fcn_model, invar)
             invar.copy_(output)
-            predvar[:, t] = output.detach().cpu()
+            predvar[:, t] = output.detach()
 
-        num_elements = torch.prod(torch.Tensor(list(predvar.shape[1:])))
+        num_elements = predvar[0].numel()  # plain int, no tensor or reduction
         loss_epoch += torch.sum(torch.pow(predvar - outvar, 2)) / num_elements
         num_examples += predvar.shape[0]
 
         # Plotting
         if i == 0:
-            predvar = predvar.numpy()
-            outvar = outvar.numpy()
+            predvar = predvar.cpu().numpy()
+            outvar = outvar.cpu().numpy()
             for chan in channels:
                 plt.close("all")
                 fig, ax = plt.subplots(
@@ -63,19 +63,15 @@ class BaseTrainer:
 
     def backward(self, loss):
         # backward pass
+        # single path for all precisions, the scaler is a pass-through when it
+        # is disabled (fp32 or bfloat16)
         torch.cuda.nvtx.range_push("Weight gradients")
-        if C.amp:
-            self.scaler.scale(loss).backward()
-            torch.cuda.nvtx.range_pop()
-            self.scaler.unscale_(self.optimizer)
-            torch.nn.utils.clip_grad_norm_(self.model.parameters(), C.grad_clip_norm)
-            self.scaler.step(self.optimizer)
-            self.scaler.update()
-        else:
-            loss.backward()
-            torch.nn.utils.clip_grad_norm_(self.model.parameters(), C.grad_clip_norm)
-            torch.cuda.nvtx.range_pop()
-            self.optimizer.step()
+        self.scaler.scale(loss).backward()
+        torch.cuda.nvtx.range_pop()
+        self.scaler.unscale_(self.optimizer)
+        torch.nn.utils.clip_grad_norm_(self.model.parameters(), C.grad_clip_norm)
+        self.scaler.step(self.optimizer)
+        self.scaler.update()
 
     def train(self, grid_nfeat, y):
         self.optimizer.zero_grad()
@@ -79,10 +79,10 @@ class GraphCastTrainer(BaseTrainer):
         if C.amp:
             rank_zero_logger.info(f"Using C.amp with dtype {C.amp_dtype}")
             if C.amp_dtype == "float16" or C.amp_dtype == "fp16":
-                self.C.amp_dtype = torch.float16
+                self.amp_dtype = torch.float16
                 self.enable_scaler = True
             elif C.amp_dtype == "bfloat16" or C.amp_dtype == "bf16":
-                self.C.amp_dtype = torch.bfloat16
+                self.amp_dtype = torch.bfloat16
             else:
                 raise ValueError("Invalid dtype for C.amp")
 
@@ -115,7 +115,21 @@ class GraphCastTrainer(BaseTrainer):
 
         # JIT compile the model, and specify the device and dtype
         if C.jit:
-            torch.jit.script(self.model).to(dtype=self.dtype).to(device=dist.device)
+            # a scripted module only keeps forward, so the checkpointing setters
+            # used when finetuning starts are not available on it
+            if (
+                C.force_single_checkpoint_finetune
+                or C.checkpoint_encoder_finetune
+                or C.checkpoint_processor_finetune
+                or C.checkpoint_decoder_finetune
+            ):
+                raise ValueError(
+                    "C.jit does not support the C.*_finetune checkpointing options, "
+                    + "switch off C.jit or the finetune checkpointing flags"
+                )
+            self.model = (
+                torch.jit.script(self.model).to(dtype=self.dtype).to(device=dist.device)
+            )
             rank_zero_logger.success("JIT compiled the model")
         else:
             self.model = self.model.to(dtype=self.dtype).to(device=dist.device)
@@ -239,6 +253,10 @@ if __name__ == "__main__":
     rank_zero_logger.info("Training started...")
     loss_agg, iter, tagged_iter, num_rollout_steps = 0, trainer.iter_init, 1, 1
     terminate_training, finetune, update_dataloader = False, False, False
+    # strip the DDP wrapper once, gradient checkpointing is set on the base model
+    base_model = (
+        trainer.model.module if hasattr(trainer.model, "module") else trainer.model
+    )
 
     with torch.autograd.profiler.emit_nvtx() if C.profile else nullcontext():
         # training loop
@@ -259,25 +277,13 @@ if __name__ == "__main__":
                 if iter >= C.num_iters_step1 + C.num_iters_step2 and not finetune:
                     finetune = True
                     if C.force_single_checkpoint_finetune:
-                        if hasattr(trainer.model, "module"):
-                            trainer.model.module.set_checkpoint_model(True)
-                        else:
-                            trainer.model.set_checkpoint_model(True)
+                        base_model.set_checkpoint_model(True)
                     if C.checkpoint_encoder_finetune:
-                        if hasattr(trainer.model, "module"):
-                            trainer.model.module.set_checkpoint_encoder(True)
-                        else:
-                            trainer.model.set_checkpoint_encoder(True)
+                        base_model.set_checkpoint_encoder(True)
                     if C.checkpoint_processor_finetune:
-                        if hasattr(trainer.model, "module"):
-                            trainer.model.module.set_checkpoint_processor(C.segments)
-                        else:
-                            trainer.model.set_checkpoint_encoder(True)
+                        base_model.set_checkpoint_processor(C.segments)
                     if C.checkpoint_decoder_finetune:
-                        if hasattr(trainer.model, "module"):
-                            trainer.model.module.set_checkpoint_decoder(True)
-                        else:
-                            trainer.model.set_checkpoint_encoder(True)
+                        base_model.set_checkpoint_decoder(True)
                 if (
                     finetune
                     and (iter - (C.num_iters_step1 + C.num_iters_step2))
@@ -314,15 +320,20 @@ if __name__ == "__main__":
                 # TODO modify for history > 0
                 data_x = data[0]["invar"]
                 data_y = data[0]["outvar"]
-                # move to device & dtype
-                data_x = data_x.to(dtype=trainer.dtype)
+                # move to device & dtype in a single copy
+                data_x = data_x.to(
+                    device=dist.device, dtype=trainer.dtype, non_blocking=True
+                )
                 grid_nfeat = data_x
-                y = data_y.to(dtype=trainer.dtype).to(device=dist.device)
+                y = data_y.to(
+                    device=dist.device, dtype=trainer.dtype, non_blocking=True
+                )
 
                 # training step
                 loss = trainer.train(grid_nfeat, y)
                 if dist.rank == 0:
-                    loss_agg += loss.detach().cpu()
+                    # accumulate on the device, only sync when the loss is logged
+                    loss_agg += loss.detach()
 
                 # validation
                 if dist.rank == 0 and iter % C.val_freq == 0:
@@ -350,12 +361,12 @@ if __name__ == "__main__":
                     )
                     logger.info(f"Saved model on rank {dist.rank}")
                     logger.log(
-                        f"iteration: {iter}, loss: {loss_agg/C.save_freq:10.3e}, \
+                        f"iteration: {iter}, loss: {float(loss_agg)/C.save_freq:10.3e}, \
                             time per iter: {(time.time()-start)/C.save_freq:10.3e}"
                     )
                     wb.log(
                         {
-                            "loss": loss_agg / C.save_freq,
+                            "loss": float(loss_agg) / C.save_freq,
                             "learning_rate": trainer.scheduler.get_last_lr()[0],
                         },
                         step=iter,
@@ -385,7 +396,7 @@ if __name__ == "__main__":
                         )
                         logger.info(f"Saved model on rank {dist.rank}")
                         logger.log(
-                            f"iteration: {iter}, loss: {loss_agg/C.save_freq:10.3e}, \
+                            f"iteration: {iter}, loss: {float(loss_agg)/C.save_freq:10.3e}, \
                                 time per iter: {(time.time()-start)/C.save_freq:10.3e}"
                         )
                     terminate_training = True
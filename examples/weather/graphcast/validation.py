@@ -43,38 +43,32 @@ class Validation:
             num_workers=C.num_workers,
         )
         print(f"Loaded validation datapipe of size {len(self.val_datapipe)}")
+        os.makedirs(C.val_dir, exist_ok=True)
 
     @torch.no_grad()
     def step(self, channels=[0, 1, 2], iter=0):
         torch.cuda.nvtx.range_push("Validation")
-        os.makedirs(C.val_dir, exist_ok=True)
         loss_epoch = 0
         for i, data in enumerate(self.val_datapipe):
-            invar = data[0]["invar"].to(dtype=self.dtype)
-            outvar = (
-                data[0]["outvar"][0].to(dtype=self.dtype).to(device=self.dist.device)
+            invar = data[0]["invar"].to(
+                device=self.dist.device, dtype=self.dtype, non_blocking=True
             )
-
-            pred = (
-                torch.empty(outvar.shape)
-                .to(dtype=self.dtype)
-                .to(device=self.dist.device)
+            outvar = data[0]["outvar"][0].to(
+                device=self.dist.device, dtype=self.dtype, non_blocking=True
             )
+
+            pred = torch.empty_like(outvar)
             for t in range(outvar.shape[0]):
                 outpred = self.model(invar)
                 pred[t] = outpred
                 invar = outpred
 
             loss_epoch += torch.mean(torch.pow(pred - outvar, 2))
-            torch.cuda.nvtx.range_pop()
-
-            pred = pred.to(torch.float32).cpu().numpy()
-            outvar = outvar.to(torch.float32).cpu().numpy()
-
-            del invar, outpred
-            torch.cuda.empty_cache()
 
             if i == 0:
+                # only the first batch is plotted, copy it to the host just here
+                pred = pred.to(torch.float32).cpu().numpy()
+                outvar = outvar.to(torch.float32).cpu().numpy()
                 for chan in channels:
                     plt.close("all")
                     fig, ax = plt.subplots(3, pred.shape[0], figsize=(15, 5))
@@ -110,4 +104,5 @@ class Validation:
                     )
                     self.wb.log({f"val_chan{chan}_iter{iter}": fig}, step=iter)
 
+        torch.cuda.nvtx.range_pop()
         return loss_epoch / len(self.val_datapipe)